@@ -0,0 +1,213 @@
+import ipaddress
+import socket
+from array import array
+from datetime import date
+
+try:
+    import numpy as np
+except ImportError:
+    # NumPy is optional; every column helper has a pure Python path
+    np = None
+
+BLOCK_SIZE = 4096
+TICKS_PER_SECOND = 10000000
+EPOCH_AS_FILETIME = 116444736000000000  # 1970-01-01 00:00:00 UTC
+_ORDINAL_1601 = date(1601, 1, 1).toordinal()
+
+def _ipv4_ranges(networks) -> tuple:
+    return tuple((int(net.network_address), int(net.netmask)) for net in networks)
+
+def _ipv4_tables():
+    """
+    Build (network, netmask) tables from the running Python's ipaddress, whose
+    private ranges differ between versions (e.g. 192.0.0.0/24 since 3.12.4):
+    - private ranges and the exceptions carved out of them (is_private)
+    - loopback and reserved ranges (is_loopback / is_reserved)
+    Returns None if the tables cannot be read or disagree with ipaddress.
+    """
+    constants = getattr(ipaddress.IPv4Address, '_constants', None)
+    try:
+        private = _ipv4_ranges(constants._private_networks)
+        exceptions = _ipv4_ranges(getattr(constants, '_private_networks_exceptions', ()))
+        other = _ipv4_ranges((constants._loopback_network, constants._reserved_network))
+    except (AttributeError, TypeError):
+        return None
+
+    def non_public(ip: int) -> bool:
+        return (
+            any((ip & mask) == net for net, mask in private)
+            and not any((ip & mask) == net for net, mask in exceptions)
+        ) or any((ip & mask) == net for net, mask in other)
+
+    for net, mask in private + exceptions + other:
+        for ip in (net, net | (~mask & 0xFFFFFFFF)):
+            addr = ipaddress.IPv4Address(ip)
+            if non_public(ip) != (addr.is_private or addr.is_loopback or addr.is_reserved):
+                return None
+    return private, exceptions, other
+
+# None: classify IPv4 with ipaddress per address instead of over the column
+IPV4_TABLES = _ipv4_tables()
+
+class RecordBlock:
+    """
+    Block of decoded records with columnar data:
+    - roots / namespaces: parsed XML and namespaces per record
+    - filetimes: TimeCreated as FILETIME (int64 column, -1 if missing or malformed)
+    - timestamps: formatted 'YYYY-MM-DD HH:MM:SS' per record
+    """
+    __slots__ = ('roots', 'namespaces', 'filetimes', 'timestamps')
+
+    def __init__(self, roots: list, namespaces: list, filetimes, timestamps: list):
+        self.roots = roots
+        self.namespaces = namespaces
+        self.filetimes = filetimes
+        self.timestamps = timestamps
+
+    def __len__(self):
+        return len(self.roots)
+
+    def __iter__(self):
+        """Yield (root, ns, timestamp) per record."""
+        return zip(self.roots, self.namespaces, self.timestamps)
+
+    def take(self, indices: list) -> 'RecordBlock':
+        """Return a new block holding only the records at the given indices."""
+        return RecordBlock(
+            [self.roots[i] for i in indices],
+            [self.namespaces[i] for i in indices],
+            take_column(self.filetimes, indices),
+            [self.timestamps[i] for i in indices]
+        )
+
+def take_column(column, indices: list):
+    """Select rows of an int64 / uint32 column."""
+    if np is not None:
+        return column[np.asarray(indices, dtype=np.intp)]
+    return array(column.typecode, [column[i] for i in indices])
+
+def parse_systemtime(sts: str) -> int:
+    """Convert 'YYYY-MM-DD[T ]HH:MM:SS[.fffffff][Z]' to FILETIME, -1 if malformed."""
+    try:
+        if sts[4] != '-' or sts[7] != '-' or sts[10] not in 'T ' or sts[13] != ':' or sts[16] != ':':
+            return -1
+        hour, minute, second = int(sts[11:13]), int(sts[14:16]), int(sts[17:19])
+        if hour > 23 or minute > 59 or second > 59:
+            return -1
+        days = date(int(sts[0:4]), int(sts[5:7]), int(sts[8:10])).toordinal() - _ORDINAL_1601
+        ticks = 0
+        if len(sts) > 19 and sts[19] == '.':
+            frac = sts[20:].rstrip('Z')[:7]
+            ticks = int(frac.ljust(7, '0')) if frac.isdigit() else 0
+        return (days * 86400 + hour * 3600 + minute * 60 + second) * TICKS_PER_SECOND + ticks
+    except (IndexError, ValueError, TypeError):
+        return -1
+
+def parse_window_bound(text: str) -> int:
+    """Parse a 'YYYY-MM-DD[ HH:MM:SS]' time window bound (UTC) to FILETIME, -1 if malformed."""
+    text = text.strip()
+    if len(text) == 10:
+        text += ' 00:00:00'
+    return parse_systemtime(text)
+
+def filetime_column(systemtimes: list):
+    """Build the int64 FILETIME column from TimeCreated/SystemTime strings."""
+    values = [parse_systemtime(sts) if sts else -1 for sts in systemtimes]
+    if np is not None:
+        return np.array(values, dtype=np.int64)
+    return array('q', values)
+
+def format_filetimes(filetimes) -> list:
+    """
+    Format a FILETIME column as 'YYYY-MM-DD HH:MM:SS' strings.
+    Entries below zero (missing / malformed) are returned as None.
+    """
+    if np is not None:
+        ft = np.asarray(filetimes, dtype=np.int64)
+        valid = ft >= 0
+        seconds = (np.where(valid, ft, EPOCH_AS_FILETIME) - EPOCH_AS_FILETIME) // TICKS_PER_SECOND
+        text = np.char.replace(np.datetime_as_string(seconds.astype('datetime64[s]'), unit='s'), 'T', ' ')
+        return [t if v else None for t, v in zip(text.tolist(), valid.tolist())]
+
+    out = []
+    for ft in filetimes:
+        if ft < 0:
+            out.append(None)
+            continue
+        days, seconds = divmod(ft // TICKS_PER_SECOND, 86400)
+        d = date.fromordinal(days + _ORDINAL_1601)
+        out.append('%04d-%02d-%02d %02d:%02d:%02d' % (
+            d.year, d.month, d.day, seconds // 3600, seconds // 60 % 60, seconds % 60
+        ))
+    return out
+
+def window_mask(filetimes, start: int = None, end: int = None) -> list[bool]:
+    """Return True for records with start <= FILETIME < end; missing times never match."""
+    if np is not None:
+        ft = np.asarray(filetimes, dtype=np.int64)
+        mask = ft >= (start if start is not None else 0)
+        if end is not None:
+            mask &= ft < end
+        return mask.tolist()
+    lo = start if start is not None else 0
+    return [ft >= lo and (end is None or ft < end) for ft in filetimes]
+
+def ipv4_column(addrs: list):
+    """
+    Build a uint32 column from dotted-quad strings.
+    Returns (column, valid) where valid marks entries that were IPv4 addresses.
+    """
+    values = []
+    valid = []
+    for addr in addrs:
+        try:
+            values.append(int.from_bytes(socket.inet_pton(socket.AF_INET, addr), 'big'))
+            valid.append(True)
+        except (OSError, TypeError, ValueError):
+            values.append(0)
+            valid.append(False)
+    if np is not None:
+        return np.array(values, dtype=np.uint32), np.array(valid, dtype=bool)
+    return array('I', values), valid
+
+def public_ip_mask(addrs: list) -> list[bool]:
+    """
+    Return True for each public (non-private, non-loopback, non-reserved) address.
+    IPv4 is classified over the whole column; other addresses fall back to ipaddress.
+    The rules are those of the running Python's ipaddress module.
+    """
+    ips, valid = ipv4_column(addrs)
+    if IPV4_TABLES is None:
+        public = [False] * len(addrs)
+        valid = [False] * len(addrs)
+    elif np is not None:
+        private, exceptions, other = IPV4_TABLES
+        in_private = np.zeros(len(ips), dtype=bool)
+        for net, mask in private:
+            in_private |= (ips & mask) == net
+        for net, mask in exceptions:
+            in_private &= (ips & mask) != net
+        non_public = in_private
+        for net, mask in other:
+            non_public |= (ips & mask) == net
+        public = (valid & ~non_public).tolist()
+        valid = valid.tolist()
+    else:
+        private, exceptions, other = IPV4_TABLES
+        public = [
+            ok and not (
+                (any((ip & mask) == net for net, mask in private)
+                 and not any((ip & mask) == net for net, mask in exceptions))
+                or any((ip & mask) == net for net, mask in other)
+            )
+            for ip, ok in zip(ips, valid)
+        ]
+
+    for i, addr in enumerate(addrs):
+        if not valid[i] and ('.' in addr or ':' in addr):
+            try:
+                ip = ipaddress.ip_address(addr)
+                public[i] = not (ip.is_private or ip.is_loopback or ip.is_reserved)
+            except ValueError:
+                pass
+    return public
@@ -0,0 +1,195 @@
+import hashlib
+import json
+import marshal
+import os
+import shutil
+import struct
+import sys
+import tempfile
+from Lib import batch
+
+EVTX_FILE_MAGIC   = b'ElfFile\x00'
+EVTX_CHUNK_MAGIC  = b'ElfChnk\x00'
+EVTX_HEADER_SIZE  = 4096
+EVTX_CHUNK_SIZE   = 65536
+# Chunk header fields hashed per chunk: record numbers/ids, offsets,
+# event records checksum (0x34) and header checksum (0x7C)
+EVTX_CHUNK_FIELDS = 0x80
+CACHE_FORMAT = 3
+
+def _size(path: str) -> int:
+    """Size of a file, or of all files below a directory."""
+    if not os.path.isdir(path):
+        return os.path.getsize(path)
+    return sum(
+        os.path.getsize(os.path.join(root, f))
+        for root, _, files in os.walk(path) for f in files
+    )
+
+def default_cache_dir() -> str:
+    """Return the cache directory used when none is given."""
+    base = os.environ.get('DFIR_EVTX_CACHE')
+    if base:
+        return base
+    root = os.environ.get('LOCALAPPDATA') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(root, 'dfir_eventlogparser')
+
+def evtx_fingerprint(evtx_path: str):
+    """
+    Content hash of an EVTX file built from its file header and the
+    checksummed header fields of every chunk, without reading record data.
+    Returns None if the file is not an EVTX file.
+    """
+    sha = hashlib.sha256()
+    with open(evtx_path, 'rb') as f:
+        header = f.read(0x80)
+        if not header.startswith(EVTX_FILE_MAGIC):
+            return None
+        size = os.fstat(f.fileno()).st_size
+        sha.update(struct.pack('<Q', size))
+        sha.update(header)
+        for offset in range(EVTX_HEADER_SIZE, size - EVTX_CHUNK_FIELDS + 1, EVTX_CHUNK_SIZE):
+            f.seek(offset)
+            chunk = f.read(EVTX_CHUNK_FIELDS)
+            # Unused chunks are zero-filled, keep hashing them so offsets stay aligned
+            sha.update(chunk if chunk.startswith(EVTX_CHUNK_MAGIC) else b'\x00')
+    return sha.hexdigest()
+
+def module_code(module) -> bytes:
+    """
+    Bytes identifying the code of a module: its file, or its compiled code
+    when the file cannot be read. Returns None if neither is available.
+    """
+    path = getattr(module, '__file__', None)
+    if path:
+        try:
+            with open(path, 'rb') as f:
+                return f.read()
+        except OSError:
+            pass
+    loader = getattr(getattr(module, '__spec__', None), 'loader', None)
+    try:
+        code = loader.get_code(module.__name__)
+    except (AttributeError, ImportError, OSError):
+        return None
+    return marshal.dumps(code) if code is not None else None
+
+def parser_version(parser_cls):
+    """
+    Version of a parser derived from its event mapping and the code of its
+    module and of the shared Lib modules, so any change invalidates cached results.
+    Returns None if the code of one of these modules cannot be read.
+    """
+    sha = hashlib.sha256()
+    sha.update(repr(sorted(getattr(parser_cls, 'DESC_MAP', {}).items())).encode('utf-8'))
+    modules = {cls.__module__ for cls in parser_cls.__mro__ if cls is not object}
+    modules.update(name for name in sys.modules if name.startswith('Lib.'))
+    for name in sorted(modules):
+        code = module_code(sys.modules[name])
+        if code is None:
+            return None
+        sha.update(name.encode('utf-8'))
+        sha.update(hashlib.sha256(code).digest())
+    return sha.hexdigest()
+
+class ResultCache:
+    """
+    Local, size-bounded cache of parser outputs:
+    - Entries are keyed by EVTX content hash, parser types and versions and options
+    - Each entry is a directory holding one output (file or directory) per name
+    - Least recently used entries are evicted once max_bytes is exceeded
+    """
+    def __init__(self, cache_dir: str = None, max_bytes: int = 2 * 1024 * 1024 * 1024):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.max_bytes = max_bytes
+
+    def make_key(self, evtx_path: str, parsers: dict, mode: str, window: tuple = None):
+        """Return the cache key for parsing evtx_path with parsers, None if not cacheable."""
+        try:
+            fingerprint = evtx_fingerprint(evtx_path)
+        except OSError:
+            return None
+        versions = {key: parser_version(cls) for key, cls in sorted(parsers.items())}
+        if fingerprint is None or None in versions.values():
+            return None
+        spec = {
+            'format': CACHE_FORMAT,
+            'evtx': fingerprint,
+            # SourceFile column is derived from the given path
+            'source': evtx_path.split('\\')[-1],
+            'mode': mode,
+            'parsers': versions,
+            'window': list(window) if window else None,
+            # Private / public IPv4 rules of the running Python (ExtIP column)
+            'ipv4': repr(batch.IPV4_TABLES)
+        }
+        return hashlib.sha256(json.dumps(spec, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def lookup(self, key: str):
+        """Return the output names stored under key (marking it recently used), or None."""
+        entry = os.path.join(self.cache_dir, key)
+        try:
+            names = sorted(os.listdir(entry))
+            os.utime(entry)
+        except OSError:
+            return None
+        return names
+
+    def restore(self, key: str, outputs: dict) -> bool:
+        """Copy cached outputs {name: destination path} back out of the cache."""
+        entry = os.path.join(self.cache_dir, key)
+        try:
+            for name, dest in outputs.items():
+                src = os.path.join(entry, name)
+                if os.path.isdir(src):
+                    shutil.rmtree(dest, ignore_errors=True)
+                    shutil.copytree(src, dest)
+                else:
+                    shutil.copyfile(src, dest)
+        except OSError:
+            return False
+        return True
+
+    def store(self, key: str, outputs: dict) -> bool:
+        """Store outputs {name: path} under key, then evict old entries."""
+        try:
+            size = sum(_size(path) for path in outputs.values())
+            if size > self.max_bytes:
+                return False
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = tempfile.mkdtemp(prefix='.tmp-', dir=self.cache_dir)
+            try:
+                for name, path in outputs.items():
+                    if os.path.isdir(path):
+                        shutil.copytree(path, os.path.join(tmp, name))
+                    else:
+                        shutil.copyfile(path, os.path.join(tmp, name))
+                entry = os.path.join(self.cache_dir, key)
+                shutil.rmtree(entry, ignore_errors=True)
+                os.replace(tmp, entry)
+            except OSError:
+                shutil.rmtree(tmp, ignore_errors=True)
+                raise
+        except OSError:
+            return False
+        self.evict(keep=key)
+        return True
+
+    def evict(self, keep: str = None):
+        """Remove least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            entry = os.path.join(self.cache_dir, name)
+            if name.startswith('.') or not os.path.isdir(entry):
+                continue
+            size = _size(entry)
+            entries.append((os.stat(entry).st_mtime, name, entry, size))
+            total += size
+        for _, name, entry, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if name == keep:
+                continue
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
@@ -2,8 +2,34 @@
 import Evtx.Evtx as evtx
 import xml.etree.ElementTree as ET
 import csv
-from datetime import datetime
-import ipaddress
+from itertools import islice
+from Lib.batch import (
+    BLOCK_SIZE, RecordBlock, filetime_column, format_filetimes,
+    parse_systemtime, public_ip_mask, take_column, window_mask
+)
+
+class MarkerExtractor:
+    """
+    Precompiled extractor for the text between two fixed markers.
+    Uses a single forward scan (str.find) instead of a regex search per record.
+    """
+    __slots__ = ('start', 'end', '_skip')
+
+    def __init__(self, start: str, end: str):
+        self.start = start
+        self.end = end
+        self._skip = len(start)
+
+    def extract(self, text: str) -> str:
+        """Return the stripped text between start and end markers, '-' if missing."""
+        i = text.find(self.start)
+        if i < 0:
+            return '-'
+        i += self._skip
+        j = text.find(self.end, i)
+        if j < 0:
+            return '-'
+        return text[i:j].strip()
 
 class BaseParser:
     """
@@ -14,10 +40,97 @@ class BaseParser:
     - Timestamp parsing
     - EventData parsing
     - Public IP check
+    Subclasses implement handle_record(); parse() drives it over blocks of records.
     """
-    def __init__(self, evtx_path: str, csv_path: str):
+    HEADER = [
+        'Timestamp', 'Logged', 'Hostname', 'ExtIP',
+        'Description', 'Details', 'EventData', 'SourceFile'
+    ]
+    # Channel / Provider names used to route records of merged logs
+    CHANNELS = ()
+    PROVIDERS = ()
+    BLOCK_SIZE = BLOCK_SIZE
+
+    def __init__(self, evtx_path: str, csv_path: str, window: tuple = None):
         self.evtx_path = evtx_path
         self.csv_path = csv_path
+        # Optional (start, end) FILETIME bounds, end exclusive
+        self.window = window
+
+    def parse(self):
+        """Parse every record of the EVTX file into the CSV output."""
+        with self.open_log() as log, self.open_csv() as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(self.HEADER)
+            try:
+                for block in self.iter_blocks(log):
+                    writer.writerows(self.handle_block(block))
+                writer.writerows(self.mask_ext_ips(self.finish()))
+            finally:
+                self.close()
+
+    def iter_blocks(self, log):
+        """
+        Decode records into RecordBlocks of BLOCK_SIZE records.
+        TimeCreated is converted to a FILETIME column, the time window is
+        applied and timestamps are formatted once per block.
+        """
+        records = log.records()
+        while True:
+            roots, namespaces, systemtimes = [], [], []
+            for record in islice(records, self.BLOCK_SIZE):
+                root = ET.fromstring(record.xml())
+                ns = self.get_namespaces(root)
+                tc = root.find('.//ev:System/ev:TimeCreated', ns)
+                roots.append(root)
+                namespaces.append(ns)
+                systemtimes.append(tc.get('SystemTime', '') if tc is not None else None)
+            if not roots:
+                return
+
+            filetimes = filetime_column(systemtimes)
+            if self.window:
+                keep = [i for i, ok in enumerate(window_mask(filetimes, *self.window)) if ok]
+                if not keep:
+                    continue
+                if len(keep) < len(roots):
+                    roots = [roots[i] for i in keep]
+                    namespaces = [namespaces[i] for i in keep]
+                    systemtimes = [systemtimes[i] for i in keep]
+                    filetimes = take_column(filetimes, keep)
+
+            # Unparsable SystemTime values are kept as-is, like parse_timestamp()
+            timestamps = [
+                ts if ts is not None else (sts.split('.')[0].replace('T', ' ') if sts is not None else '-')
+                for ts, sts in zip(format_filetimes(filetimes), systemtimes)
+            ]
+            yield RecordBlock(roots, namespaces, filetimes, timestamps)
+
+    def handle_block(self, block: RecordBlock) -> list[list]:
+        """Return the CSV rows produced by one block of records."""
+        rows = []
+        for root, ns, timestamp in block:
+            rows.extend(self.handle_record(root, ns, timestamp))
+        return self.mask_ext_ips(rows)
+
+    def handle_record(self, root: ET.Element, ns: dict, timestamp: str) -> list[list]:
+        """
+        Return the CSV rows produced by one decoded record (may be empty).
+        The ExtIP column holds the candidate address; mask_ext_ips() keeps public ones.
+        """
+        raise NotImplementedError
+
+    def finish(self) -> list[list]:
+        """Return rows still pending once all records were handled."""
+        return []
+
+    def close(self):
+        """Release per-parse resources."""
+        pass
+
+    def extra_outputs(self) -> dict:
+        """Return outputs written next to the CSV as {suffix: '<csv>_<suffix>' path}."""
+        return {}
 
     def open_log(self):
         """Open EVTX file for reading."""
@@ -52,11 +165,8 @@ class BaseParser:
         """Parse TimeCreated/SystemTime to formatted 'YYYY-MM-DD HH:MM:SS'."""
         tc = root.find('.//ev:System/ev:TimeCreated', ns)
         if tc is not None:
-            sts = tc.get('SystemTime','').split('.')[0]
-            try:
-                return datetime.strptime(sts, '%Y-%m-%dT%H:%M:%S').strftime('%Y-%m-%d %H:%M:%S')
-            except ValueError:
-                return sts.replace('T',' ')
+            sts = tc.get('SystemTime','')
+            return format_filetimes([parse_systemtime(sts)])[0] or sts.split('.')[0].replace('T',' ')
         return '-'
 
     @staticmethod
@@ -74,8 +184,13 @@ class BaseParser:
     @staticmethod
     def is_public_ip(addr: str) -> bool:
         """Return True if addr is a public (non-private) IP address."""
-        try:
-            ip = ipaddress.ip_address(addr)
-            return not (ip.is_private or ip.is_loopback or ip.is_reserved)
-        except ValueError:
-            return False
\ No newline at end of file
+        return public_ip_mask([addr])[0]
+
+    @staticmethod
+    def mask_ext_ips(rows: list[list]) -> list[list]:
+        """Replace non-public ExtIP candidates with '-', classifying the whole column at once."""
+        if rows:
+            for row, public in zip(rows, public_ip_mask([row[3] for row in rows])):
+                if not public:
+                    row[3] = '-'
+        return rows
\ No newline at end of file
@@ -0,0 +1,74 @@
+import os
+from contextlib import ExitStack
+from Lib.common import BaseParser, ET, csv
+
+class MultiChannelParser(BaseParser):
+    """
+    Single-pass parser for logs holding several channels side by side
+    (ForwardedEvents.evtx, merged exports):
+    - Each record is read and decoded once, in blocks (see BaseParser.iter_blocks)
+    - Records are routed by Channel (Provider as fallback) to the matching parser
+    - Each parser writes its own CSV '<evtx name>_<parser type>.csv' in output_dir,
+      created when the first record for it is seen
+    parse() returns {parser type: CSV path}, plus '<parser type>.<suffix>'
+    entries for the parsers' extra outputs.
+    """
+    def __init__(self, evtx_path: str, output_dir: str, parsers: dict, window: tuple = None):
+        super().__init__(evtx_path, None, window)
+        self.output_dir = output_dir
+        self.parsers = parsers
+        self.outputs = {}
+        self._by_channel = {}
+        self._by_provider = {}
+        for key, parser_cls in parsers.items():
+            for channel in parser_cls.CHANNELS:
+                self._by_channel[channel.lower()] = key
+            for provider in parser_cls.PROVIDERS:
+                self._by_provider[provider.lower()] = key
+
+    def output_path(self, key: str) -> str:
+        """Return the CSV path used for the given parser type."""
+        stem = os.path.splitext(os.path.basename(self.evtx_path))[0]
+        return os.path.join(self.output_dir, f"{stem}_{key}.csv")
+
+    def route(self, root: ET.Element, ns: dict):
+        """Return the parser type for a record, or None if no parser handles it."""
+        channel = self.safe_find_text(root, './ev:System/ev:Channel', ns).lower()
+        key = self._by_channel.get(channel)
+        if key is None:
+            provider = root.find('./ev:System/ev:Provider', ns)
+            name = provider.get('Name', '') if provider is not None else ''
+            key = self._by_provider.get(name.lower())
+        return key
+
+    def parse(self):
+        """Parse every record once, writing one CSV per channel seen."""
+        active = {}
+        with ExitStack() as stack, self.open_log() as log:
+            for block in self.iter_blocks(log):
+                routed = {}
+                for i, (root, ns) in enumerate(zip(block.roots, block.namespaces)):
+                    key = self.route(root, ns)
+                    if key is not None:
+                        routed.setdefault(key, []).append(i)
+
+                for key, indices in routed.items():
+                    if key not in active:
+                        csv_path = self.output_path(key)
+                        parser_inst = self.parsers[key](self.evtx_path, csv_path)
+                        stack.callback(parser_inst.close)
+                        writer = csv.writer(stack.enter_context(parser_inst.open_csv()))
+                        writer.writerow(parser_inst.HEADER)
+                        active[key] = (parser_inst, writer)
+                        self.outputs[key] = csv_path
+
+                    parser_inst, writer = active[key]
+                    writer.writerows(parser_inst.handle_block(block.take(indices)))
+
+            for parser_inst, writer in active.values():
+                writer.writerows(parser_inst.mask_ext_ips(parser_inst.finish()))
+
+        for key, (parser_inst, _) in active.items():
+            for suffix, path in parser_inst.extra_outputs().items():
+                self.outputs[f"{key}.{suffix}"] = path
+        return self.outputs
@@ -0,0 +1,209 @@
+import hashlib
+import tempfile
+from collections import OrderedDict
+
+READ_CHUNK_SIZE = 1024 * 1024
+
+class _SpillFile:
+    """
+    Temporary file shared by all spilled blocks of one buffer.
+    Opened on first use and truncated once no block references it.
+    """
+    __slots__ = ('spill_dir', 'file', 'users')
+
+    def __init__(self, spill_dir: str = None):
+        self.spill_dir = spill_dir
+        self.file = None
+        self.users = 0
+
+    def acquire(self):
+        if self.file is None:
+            self.file = tempfile.TemporaryFile(dir=self.spill_dir)
+        self.users += 1
+
+    def release(self):
+        self.users -= 1
+        if self.users == 0 and self.file is not None:
+            self.file.seek(0)
+            self.file.truncate()
+
+    def append(self, data: bytes) -> tuple[int, int]:
+        """Append data, return its (offset, length)."""
+        self.file.seek(0, 2)
+        offset = self.file.tell()
+        self.file.write(data)
+        return offset, len(data)
+
+    def read(self, offset: int, length: int) -> bytes:
+        self.file.seek(offset)
+        return self.file.read(length)
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        self.users = 0
+
+class _PendingBlock:
+    """
+    Parts of one ScriptBlockId received so far.
+    Parts are kept as UTF-8 bytes in memory until the block is spilled,
+    after which they are appended to the buffer's spill file.
+    Emitted blocks are handed out as readers; close them once consumed.
+    """
+    __slots__ = ('meta', 'total', 'late', 'parts', 'spilled', 'spill', 'size')
+
+    def __init__(self, meta: dict, total: int, late: bool = False):
+        self.meta = meta
+        self.total = total
+        self.late = late     # parts arriving after the block was evicted
+        self.parts = {}      # number -> bytes (in memory)
+        self.spilled = {}    # number -> (offset, length) in spill file
+        self.spill = None    # shared _SpillFile once spilled
+        self.size = 0
+
+    def received(self) -> int:
+        return len(self.parts) + len(self.spilled)
+
+    def has(self, number: int) -> bool:
+        return number in self.parts or number in self.spilled
+
+    def spill_to_disk(self, spill: _SpillFile) -> int:
+        """Move in-memory parts to the spill file, return bytes released."""
+        if self.spill is None:
+            spill.acquire()
+            self.spill = spill
+        for number, data in self.parts.items():
+            self.spilled[number] = spill.append(data)
+        released = self.size
+        self.parts.clear()
+        self.size = 0
+        return released
+
+    def iter_bytes(self, chunk_size: int = READ_CHUNK_SIZE):
+        """Yield the received parts in order, spilled parts in chunks of chunk_size."""
+        for number in range(1, self.total + 1):
+            if number in self.parts:
+                yield self.parts[number]
+            elif number in self.spilled:
+                offset, length = self.spilled[number]
+                while length > 0:
+                    data = self.spill.read(offset, min(chunk_size, length))
+                    if not data:
+                        break
+                    offset += len(data)
+                    length -= len(data)
+                    yield data
+
+    def close(self):
+        self.parts.clear()
+        self.spilled.clear()
+        if self.spill is not None:
+            self.spill.release()
+            self.spill = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class ScriptBlockBuffer:
+    """
+    Bounded reassembly buffer for multi-part PowerShell script blocks (4104):
+    - Parts are grouped by ScriptBlockId until MessageTotal parts are seen
+    - Buffered text above max_memory bytes is spilled to one temporary file
+    - At most max_pending blocks are kept; the least recently updated one
+      is emitted incomplete, and later parts of it are flagged as late
+    Completed blocks are returned as dicts with the SHA256 and size of the
+    script and a 'reader' streaming its bytes, which the caller must close.
+    """
+    def __init__(self, max_memory: int = 64 * 1024 * 1024, max_pending: int = 1024, spill_dir: str = None):
+        self.max_memory = max_memory
+        self.max_pending = max_pending
+        self.spill = _SpillFile(spill_dir)
+        self._pending = OrderedDict()
+        self._evicted = OrderedDict()   # bounded set of evicted ScriptBlockIds
+        self._memory = 0
+
+    def add(self, block_id: str, number: int, total: int, text: str, meta: dict) -> list[dict]:
+        """
+        Add one part of a script block.
+        Returns the blocks completed or evicted by this call (usually zero or one).
+        """
+        done = []
+        block = self._pending.get(block_id)
+        if block is None:
+            block = _PendingBlock(meta, max(total, 1), block_id in self._evicted)
+            self._pending[block_id] = block
+        else:
+            self._pending.move_to_end(block_id)
+
+        if number == 1:
+            # Keep the metadata of the first part (timestamp, path)
+            block.meta = meta
+
+        if 1 <= number <= block.total and not block.has(number):
+            data = text.encode('utf-8')
+            if block.spill is not None:
+                block.spilled[number] = block.spill.append(data)
+            else:
+                block.parts[number] = data
+                block.size += len(data)
+                self._memory += len(data)
+
+        if block.received() >= block.total:
+            done.append(self._emit(block_id))
+        else:
+            self._enforce_limits(done)
+        return done
+
+    def flush(self) -> list[dict]:
+        """Emit all remaining (incomplete) blocks, least recently updated first."""
+        return [self._emit(block_id) for block_id in list(self._pending)]
+
+    def close(self):
+        """Drop any blocks still pending and close the spill file."""
+        for block in self._pending.values():
+            block.close()
+        self._pending.clear()
+        self._memory = 0
+        self.spill.close()
+
+    def _enforce_limits(self, done: list):
+        while len(self._pending) > self.max_pending:
+            block_id = next(iter(self._pending))
+            done.append(self._emit(block_id))
+            self._evicted[block_id] = None
+            if len(self._evicted) > 4 * self.max_pending:
+                self._evicted.popitem(last=False)
+        if self._memory <= self.max_memory:
+            return
+        # Spill the largest in-memory blocks first
+        for block in sorted(self._pending.values(), key=lambda b: b.size, reverse=True):
+            if self._memory <= self.max_memory or not block.size:
+                break
+            self._memory -= block.spill_to_disk(self.spill)
+
+    def _emit(self, block_id: str) -> dict:
+        block = self._pending.pop(block_id)
+        self._memory -= block.size
+        sha = hashlib.sha256()
+        size = 0
+        try:
+            for data in block.iter_bytes():
+                sha.update(data)
+                size += len(data)
+        except BaseException:
+            block.close()
+            raise
+        return {
+            'id': block_id,
+            'meta': block.meta,
+            'total': block.total,
+            'late': block.late,
+            'received': block.received(),
+            'size': size,
+            'sha256': sha.hexdigest(),
+            'reader': block
+        }
@@ -1,4 +1,4 @@
-from Lib.common import BaseParser, ET, csv
+from Lib.common import BaseParser
 
 class TerminalServicesLSMParser(BaseParser):
     """
@@ -14,45 +14,41 @@ class TerminalServicesLSMParser(BaseParser):
         '40': 'RDP session disconnect by user (40)'
     }
 
-    def parse(self):
-        with self.open_log() as log, self.open_csv() as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerow([
-                'Timestamp', 'Logged', 'Hostname', 'ExtIP',
-                'Description', 'Details', '-', 'SourceFile'
-            ])
-            for record in log.records():
-                root = ET.fromstring(record.xml())
-                ns = self.get_namespaces(root)
+    CHANNELS  = ('Microsoft-Windows-TerminalServices-LocalSessionManager/Operational',)
+    PROVIDERS = ('Microsoft-Windows-TerminalServices-LocalSessionManager',)
+    HEADER = [
+        'Timestamp', 'Logged', 'Hostname', 'ExtIP',
+        'Description', 'Details', '-', 'SourceFile'
+    ]
 
-                event_id = self.safe_find_text(root, './/ev:System/ev:EventID', ns)
-                if event_id not in self.DESC_MAP:
-                    continue
+    def handle_record(self, root, ns, timestamp):
+        event_id = self.safe_find_text(root, './/ev:System/ev:EventID', ns)
+        if event_id not in self.DESC_MAP:
+            return []
 
-                timestamp = self.parse_timestamp(root, ns)
-                hostname  = self.safe_find_text(root, './/ev:System/ev:Computer', ns)
+        hostname  = self.safe_find_text(root, './/ev:System/ev:Computer', ns)
 
-                ud_parent = root.find('.//ev:UserData', ns)
-                if not ud_parent:
-                    continue
-                ud_elem = next(iter(ud_parent), None)
-                if not ud_elem:
-                    continue
-                ns['ud'] = ud_elem.tag[1:].split('}')[0] if ud_elem.tag.startswith('{') else ''
+        ud_parent = root.find('.//ev:UserData', ns)
+        if not ud_parent:
+            return []
+        ud_elem = next(iter(ud_parent), None)
+        if not ud_elem:
+            return []
+        ns['ud'] = ud_elem.tag[1:].split('}')[0] if ud_elem.tag.startswith('{') else ''
 
-                # Dispatch to handler
-                details, extip = self._dispatch(event_id, ud_elem, ns)
+        # Dispatch to handler
+        details, extip = self._dispatch(event_id, ud_elem, ns)
 
-                writer.writerow([
-                    timestamp,
-                    'Logged',
-                    hostname or '-',
-                    extip,
-                    self.DESC_MAP[event_id],
-                    details,
-                    '-',
-                    self.evtx_path.split('\\')[-1]
-                ])
+        return [[
+            timestamp,
+            'Logged',
+            hostname or '-',
+            extip,
+            self.DESC_MAP[event_id],
+            details,
+            '-',
+            self.evtx_path.split('\\')[-1]
+        ]]
 
     def _dispatch(self, event_id, ud_elem, ns):
         """
@@ -74,7 +70,7 @@ class TerminalServicesLSMParser(BaseParser):
         user       = self.safe_find_text(ud_elem, 'ud:User', ns)
         addr       = self.safe_find_text(ud_elem, 'ud:Address', ns)
         session_id = self.safe_find_text(ud_elem, 'ud:SessionID', ns)
-        extip      = addr if self.is_public_ip(addr) else '-'
+        extip      = addr  # kept only if public, see mask_ext_ips
         details    = f"User: {user}, IP: {addr}, Session ID: {session_id}"
         return details, extip
 
@@ -1,5 +1,6 @@
-from Lib.common import BaseParser, ET, csv
-import re
+from Lib.common import BaseParser, MarkerExtractor
+
+HOST_APPLICATION = MarkerExtractor('HostApplication=', 'EngineVersion=')
 
 class PowerShellParser(BaseParser):
     """
@@ -7,46 +8,37 @@ class PowerShellParser(BaseParser):
     """
     DESC_MAP = {'400': 'PowerShell command executed'}
 
-    def parse(self):
-        with self.open_log() as log, self.open_csv() as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerow([
-                'Timestamp', 'Logged', 'Hostname', 'ExtIP',
-                'Description', 'Details', 'EventData', 'SourceFile'
-            ])
-
-            for record in log.records():
-                root = ET.fromstring(record.xml())
-                ns = self.get_namespaces(root)
+    CHANNELS  = ('Windows PowerShell',)
+    PROVIDERS = ('PowerShell',)
 
-                event_id = self.safe_find_text(root, './/ev:System/ev:EventID', ns)
-                if event_id not in self.DESC_MAP:
-                    continue
+    def handle_record(self, root, ns, timestamp):
+        event_id = self.safe_find_text(root, './/ev:System/ev:EventID', ns)
+        if event_id not in self.DESC_MAP:
+            return []
 
-                timestamp = self.parse_timestamp(root, ns)
-                hostname = self.safe_find_text(root, './/ev:System/ev:Computer', ns)
+        hostname = self.safe_find_text(root, './/ev:System/ev:Computer', ns)
 
-                # Parse EventData once
-                evdata = self.parse_event_data(root, ns)
-                evdata_str = '; '.join(f"{k}={v}" for k, v in evdata.items()) or '-'
+        # Parse EventData once
+        evdata = self.parse_event_data(root, ns)
+        evdata_str = '; '.join(f"{k}={v}" for k, v in evdata.items()) or '-'
 
-                # Extract raw command from last <Data>
-                data_nodes = root.findall('.//ev:EventData/ev:Data', ns)
-                raw_text = data_nodes[-1].text.strip() if data_nodes and data_nodes[-1].text else ''
+        # Extract raw command from last <Data>
+        data_nodes = root.findall('.//ev:EventData/ev:Data', ns)
+        raw_text = data_nodes[-1].text.strip() if data_nodes and data_nodes[-1].text else ''
 
-                # Dispatch to handler
-                details, extip = self._dispatch(event_id, raw_text)
+        # Dispatch to handler
+        details, extip = self._dispatch(event_id, raw_text)
 
-                writer.writerow([
-                    timestamp,
-                    'Logged',
-                    hostname or '-',
-                    extip,
-                    self.DESC_MAP[event_id],
-                    details,
-                    evdata_str,
-                    self.evtx_path.split('\\')[-1]
-                ])
+        return [[
+            timestamp,
+            'Logged',
+            hostname or '-',
+            extip,
+            self.DESC_MAP[event_id],
+            details,
+            evdata_str,
+            self.evtx_path.split('\\')[-1]
+        ]]
 
     def _dispatch(self, event_id: str, raw_text: str) -> tuple[str, str]:
         """
@@ -68,5 +60,4 @@ class PowerShellParser(BaseParser):
         """
         Extract substring between HostApplication= and EngineVersion=.
         """
-        match = re.search(r"HostApplication=(.*?)EngineVersion=", text, re.DOTALL)
-        return match.group(1).strip() if match else '-'
+        return HOST_APPLICATION.extract(text)
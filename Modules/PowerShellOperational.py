@@ -0,0 +1,139 @@
+import os
+import shutil
+from Lib.common import BaseParser, MarkerExtractor, ET
+from Lib.scriptblock import ScriptBlockBuffer
+
+# Fields of the 4103 ContextInfo block ("        Host Application = ...\r\n")
+CTX_HOST_APPLICATION = MarkerExtractor('Host Application = ', '\n')
+CTX_COMMAND_NAME     = MarkerExtractor('Command Name = ', '\n')
+CTX_USER             = MarkerExtractor('User = ', '\n')
+
+class PowerShellOperationalParser(BaseParser):
+    """
+    Parser for Microsoft-Windows-PowerShell/Operational events.
+    Script blocks split across several 4104 records are reassembled
+    and written as one row per script with its SHA256. The script itself
+    is streamed to '<output>_scripts/<sha256>.ps1'; EventData holds the file
+    name only, so the CSV is the same whatever the output name.
+    """
+    DESC_MAP = {
+        '4103': 'PowerShell pipeline executed',
+        '4104': 'PowerShell script block logged'
+    }
+    CHANNELS  = ('Microsoft-Windows-PowerShell/Operational',)
+    PROVIDERS = ('Microsoft-Windows-PowerShell',)
+    MAX_BUFFER_BYTES   = 64 * 1024 * 1024
+    MAX_PENDING_BLOCKS = 1024
+
+    def __init__(self, evtx_path: str, csv_path: str, window: tuple = None):
+        super().__init__(evtx_path, csv_path, window)
+        self.buffer = ScriptBlockBuffer(self.MAX_BUFFER_BYTES, self.MAX_PENDING_BLOCKS)
+        self.scripts_dir = os.path.splitext(csv_path)[0] + '_scripts'
+
+    def open_csv(self):
+        # Scripts of a previous run on the same output are replaced, like the CSV
+        shutil.rmtree(self.scripts_dir, ignore_errors=True)
+        return super().open_csv()
+
+    def handle_record(self, root, ns, timestamp):
+        event_id = self.safe_find_text(root, './/ev:System/ev:EventID', ns)
+        if event_id not in self.DESC_MAP:
+            return []
+
+        hostname = self.safe_find_text(root, './/ev:System/ev:Computer', ns)
+
+        # Parse EventData once
+        evdata = self.parse_event_data(root, ns)
+
+        if event_id == '4103':
+            details, evdata_str = self._handle_4103(evdata)
+            return [[
+                timestamp,
+                'Logged',
+                hostname or '-',
+                '-',
+                self.DESC_MAP[event_id],
+                details,
+                evdata_str,
+                self.evtx_path.split('\\')[-1]
+            ]]
+
+        meta = {'timestamp': timestamp, 'hostname': hostname, 'path': evdata.get('Path', '-')}
+        return [self._script_row(block) for block in self._handle_4104(root, ns, evdata, meta)]
+
+    def finish(self):
+        return [self._script_row(block) for block in self.buffer.flush()]
+
+    def close(self):
+        self.buffer.close()
+
+    def extra_outputs(self):
+        return {'scripts': self.scripts_dir} if os.path.isdir(self.scripts_dir) else {}
+
+    def _handle_4103(self, evdata: dict) -> tuple[str, str]:
+        """
+        Handle PowerShell pipeline execution (module logging, 4103).
+        """
+        # EventData values are stripped, restore the last line terminator
+        context = evdata.get('ContextInfo', '') + '\n'
+        user     = CTX_USER.extract(context)
+        command  = CTX_COMMAND_NAME.extract(context)
+        host_app = CTX_HOST_APPLICATION.extract(context)
+        details = f"User: {user}, Command: {command}, HostApplication: {host_app}"
+        return details, evdata.get('Payload', '-')
+
+    def _handle_4104(self, root: ET.Element, ns: dict, evdata: dict, meta: dict) -> list[dict]:
+        """
+        Feed one script block part (4104) into the reassembly buffer.
+        Returns the script blocks completed by this part.
+        """
+        try:
+            number = int(evdata.get('MessageNumber', '1'))
+            total  = int(evdata.get('MessageTotal', '1'))
+        except ValueError:
+            number, total = 1, 1
+        block_id = evdata.get('ScriptBlockId', '-')
+
+        # ScriptBlockText keeps its original whitespace
+        node = root.find(".//ev:EventData/ev:Data[@Name='ScriptBlockText']", ns)
+        text = node.text if node is not None and node.text else ''
+        return self.buffer.add(block_id, number, total, text, meta)
+
+    def _script_row(self, block: dict) -> list:
+        """
+        Build the CSV row for a reassembled script block, writing the script file.
+        """
+        with block['reader'] as reader:
+            script = self._write_script(reader, block['sha256']) if block['size'] else '-'
+        meta = block['meta']
+        # Parts received after their block was evicted are reported separately
+        late = ' (late parts of an evicted block)' if block['late'] else ''
+        details = (
+            f"ScriptBlockId: {block['id']}, Path: {meta['path']}, "
+            f"Parts: {block['received']}/{block['total']}{late}, SHA256: {block['sha256']}"
+        )
+        return [
+            meta['timestamp'],
+            'Logged',
+            meta['hostname'] or '-',
+            '-',
+            self.DESC_MAP['4104'],
+            details,
+            script,
+            self.evtx_path.split('\\')[-1]
+        ]
+
+    def _write_script(self, reader, sha256: str) -> str:
+        """
+        Stream a reassembled script to the scripts directory.
+        Returns its file name in the scripts directory; identical scripts share one file.
+        """
+        name = f"{sha256}.ps1"
+        path = os.path.join(self.scripts_dir, name)
+        if not os.path.exists(path):
+            os.makedirs(self.scripts_dir, exist_ok=True)
+            with open(path + '.tmp', 'wb') as f:
+                for data in reader.iter_bytes():
+                    f.write(data)
+            os.replace(path + '.tmp', path)
+        return name
@@ -1,4 +1,4 @@
-from Lib.common import BaseParser, ET, csv
+from Lib.common import BaseParser
 
 class SecurityParser(BaseParser):
     """
@@ -23,62 +23,52 @@ class SecurityParser(BaseParser):
         '4733': 'Account removed from a group'
     }
     ALLOWED = {'3', '7', '10'}
-
-    def parse(self):
-        with self.open_log() as log, self.open_csv() as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerow([
-                'Timestamp', 'Logged', 'Hostname', 'ExtIP',
-                'Description', 'Details', 'EventData', 'SourceFile'
-            ])
-
-            for record in log.records():
-                root = ET.fromstring(record.xml())
-                ns = self.get_namespaces(root)
-
-                # Override 'ud' namespace dynamically
-                ud_parent = root.find('.//ev:UserData', ns)
-                ud_elem = next(iter(ud_parent), None) if ud_parent is not None else None
-                ns['ud'] = ud_elem.tag[1:].split('}')[0] if ud_elem is not None and ud_elem.tag.startswith('{') else ''
-
-                # Extract Event ID
-                eid = self.safe_find_text(root, './/ev:System/ev:EventID', ns)
-                if eid not in self.DESC_MAP:
-                    continue
-
-                timestamp = self.parse_timestamp(root, ns)
-                hostname = self.safe_find_text(root, './/ev:System/ev:Computer', ns)
-
-                # Parse EventData for non-1102 events
-                evdata = {} if eid == '1102' else self.parse_event_data(root, ns)
-
-                # Dispatch to handler
-                if eid == '1102':
-                    details, evdata_str, extip = self._handle_1102(ud_elem, ns)
-                elif eid in {'4624', '4625', '4634', '4648'}:
-                    details, evdata_str, extip = self._handle_logon(evdata)
-                    if details is None:
-                        continue
-                elif eid in {'4732', '4733'}:
-                    details, evdata_str, extip = self._handle_group(evdata)
-                elif eid in {'4720', '4722', '4723', '4724', '4725', '4726', '4738', '4781'}:
-                    details, evdata_str, extip = self._handle_account_events(evdata)
-                else:
-                    # Process Created (4688) or other events
-                    details = evdata.get('ProcessName', '-') if eid == '4688' else '-'
-                    evdata_str = '-' #'; '.join(f"{k}={v}" for k, v in evdata.items()) or '-'
-                    extip = '-'
-
-                writer.writerow([
-                    timestamp,
-                    'Logged',
-                    hostname or '-',
-                    extip,
-                    self.DESC_MAP[eid],
-                    details,
-                    evdata_str,
-                    self.evtx_path.split('\\')[-1]
-                ])
+    CHANNELS  = ('Security',)
+    PROVIDERS = ('Microsoft-Windows-Security-Auditing',)
+
+    def handle_record(self, root, ns, timestamp):
+        # Override 'ud' namespace dynamically
+        ud_parent = root.find('.//ev:UserData', ns)
+        ud_elem = next(iter(ud_parent), None) if ud_parent is not None else None
+        ns['ud'] = ud_elem.tag[1:].split('}')[0] if ud_elem is not None and ud_elem.tag.startswith('{') else ''
+
+        # Extract Event ID
+        eid = self.safe_find_text(root, './/ev:System/ev:EventID', ns)
+        if eid not in self.DESC_MAP:
+            return []
+
+        hostname = self.safe_find_text(root, './/ev:System/ev:Computer', ns)
+
+        # Parse EventData for non-1102 events
+        evdata = {} if eid == '1102' else self.parse_event_data(root, ns)
+
+        # Dispatch to handler
+        if eid == '1102':
+            details, evdata_str, extip = self._handle_1102(ud_elem, ns)
+        elif eid in {'4624', '4625', '4634', '4648'}:
+            details, evdata_str, extip = self._handle_logon(evdata)
+            if details is None:
+                return []
+        elif eid in {'4732', '4733'}:
+            details, evdata_str, extip = self._handle_group(evdata)
+        elif eid in {'4720', '4722', '4723', '4724', '4725', '4726', '4738', '4781'}:
+            details, evdata_str, extip = self._handle_account_events(evdata)
+        else:
+            # Process Created (4688) or other events
+            details = evdata.get('ProcessName', '-') if eid == '4688' else '-'
+            evdata_str = '-' #'; '.join(f"{k}={v}" for k, v in evdata.items()) or '-'
+            extip = '-'
+
+        return [[
+            timestamp,
+            'Logged',
+            hostname or '-',
+            extip,
+            self.DESC_MAP[eid],
+            details,
+            evdata_str,
+            self.evtx_path.split('\\')[-1]
+        ]]
 
     def _handle_1102(self, ud_elem, ns):
         """
@@ -104,7 +94,7 @@ class SecurityParser(BaseParser):
         ip       = evdata.get('IpAddress', '-')
         port     = evdata.get('IpPort', '-')
         process  = evdata.get('ProcessName', '-')
-        extip    = ip if self.is_public_ip(ip) else '-'
+        extip    = ip  # kept only if public, see mask_ext_ips
 
         details = (
             f"User: {user}, LogonType: {lt}, "
@@ -1,4 +1,4 @@
-from Lib.common import BaseParser, ET, csv
+from Lib.common import BaseParser
 
 class SystemParser(BaseParser):
     """
@@ -10,47 +10,42 @@ class SystemParser(BaseParser):
         '104': 'EventLog cleared'
     }
 
-    def parse(self):
-        with self.open_log() as log, self.open_csv() as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerow([
-                'Timestamp', 'Logged', 'Hostname', 'ExtIP',
-                'Description', 'Details', '-', 'SourceFile'
-            ])
+    CHANNELS  = ('System',)
+    PROVIDERS = ('Service Control Manager',)
+    HEADER = [
+        'Timestamp', 'Logged', 'Hostname', 'ExtIP',
+        'Description', 'Details', '-', 'SourceFile'
+    ]
 
-            for record in log.records():
-                root = ET.fromstring(record.xml())
-                ns = self.get_namespaces(root)
+    def handle_record(self, root, ns, timestamp):
+        # Override 'ud' namespace dynamically
+        ud_parent = root.find('.//ev:UserData', ns)
+        ud_elem = next(iter(ud_parent), None) if ud_parent is not None else None
+        ns['ud'] = ud_elem.tag[1:].split('}')[0] if ud_elem is not None and ud_elem.tag.startswith('{') else ''
 
-                # Override 'ud' namespace dynamically
-                ud_parent = root.find('.//ev:UserData', ns)
-                ud_elem = next(iter(ud_parent), None) if ud_parent is not None else None
-                ns['ud'] = ud_elem.tag[1:].split('}')[0] if ud_elem is not None and ud_elem.tag.startswith('{') else ''
+        event_id = self.safe_find_text(root, './/ev:System/ev:EventID', ns)
+        if event_id not in self.DESC_MAP:
+            return []
 
-                event_id = self.safe_find_text(root, './/ev:System/ev:EventID', ns)
-                if event_id not in self.DESC_MAP:
-                    continue
+        # Common parsing
+        hostname = self.safe_find_text(root, './/ev:System/ev:Computer', ns)
 
-                # Common parsing
-                timestamp = self.parse_timestamp(root, ns)
-                hostname = self.safe_find_text(root, './/ev:System/ev:Computer', ns)
+        # Parse EventData for service events
+        evdata = self.parse_event_data(root, ns) if event_id in {'7036', '7045'} else None
 
-                # Parse EventData for service events
-                evdata = self.parse_event_data(root, ns) if event_id in {'7036', '7045'} else None
+        # Route to handler
+        details = self._dispatch(event_id, ud_elem, ns, evdata)
 
-                # Route to handler
-                details = self._dispatch(event_id, ud_elem, ns, evdata)
-
-                writer.writerow([
-                    timestamp,
-                    'Logged',
-                    hostname or '-',
-                    '-',
-                    self.DESC_MAP[event_id],
-                    details,
-                    '-',
-                    self.evtx_path.split('\\')[-1]
-                ])
+        return [[
+            timestamp,
+            'Logged',
+            hostname or '-',
+            '-',
+            self.DESC_MAP[event_id],
+            details,
+            '-',
+            self.evtx_path.split('\\')[-1]
+        ]]
 
     def _dispatch(self, event_id, ud_elem, ns, evdata):
         """
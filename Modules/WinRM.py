@@ -1,4 +1,4 @@
-from Lib.common import BaseParser, ET, csv
+from Lib.common import BaseParser
 
 class WinRMParser(BaseParser):
     """
@@ -9,41 +9,36 @@ class WinRMParser(BaseParser):
         '145': 'WSMan operation started'
     }
 
-    def parse(self):
-        with self.open_log() as log, self.open_csv() as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerow([
-                'Timestamp', 'Logged', 'Hostname', 'ExtIP',
-                'Description', 'Details', '-', 'SourceFile'
-            ])
+    CHANNELS  = ('Microsoft-Windows-WinRM/Operational',)
+    PROVIDERS = ('Microsoft-Windows-WinRM',)
+    HEADER = [
+        'Timestamp', 'Logged', 'Hostname', 'ExtIP',
+        'Description', 'Details', '-', 'SourceFile'
+    ]
 
-            for record in log.records():
-                root = ET.fromstring(record.xml())
-                ns = self.get_namespaces(root)
+    def handle_record(self, root, ns, timestamp):
+        event_id = self.safe_find_text(root, './/ev:System/ev:EventID', ns)
+        if event_id not in self.DESC_MAP:
+            return []
 
-                event_id = self.safe_find_text(root, './/ev:System/ev:EventID', ns)
-                if event_id not in self.DESC_MAP:
-                    continue
+        hostname = self.safe_find_text(root, './/ev:System/ev:Computer', ns)
 
-                timestamp = self.parse_timestamp(root, ns)
-                hostname = self.safe_find_text(root, './/ev:System/ev:Computer', ns)
+        # Parse EventData once
+        evdata = self.parse_event_data(root, ns)
 
-                # Parse EventData once
-                evdata = self.parse_event_data(root, ns)
+        # Dispatch to handler
+        details, extip = self._dispatch(event_id, evdata)
 
-                # Dispatch to handler
-                details, extip = self._dispatch(event_id, evdata)
-
-                writer.writerow([
-                    timestamp,
-                    'Logged',
-                    hostname or '-',
-                    extip,
-                    self.DESC_MAP[event_id],
-                    details,
-                    '-',
-                    self.evtx_path.split('\\')[-1]
-                ])
+        return [[
+            timestamp,
+            'Logged',
+            hostname or '-',
+            extip,
+            self.DESC_MAP[event_id],
+            details,
+            '-',
+            self.evtx_path.split('\\')[-1]
+        ]]
 
     def _dispatch(self, event_id: str, evdata: dict) -> tuple[str, str]:
         """
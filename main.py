@@ -4,15 +4,20 @@ import sys
 from Modules.LocalSessionManager import TerminalServicesLSMParser
 from Modules.RDPClient import TerminalServicesCAXParser
 from Modules.PowerShell import PowerShellParser
+from Modules.PowerShellOperational import PowerShellOperationalParser
 from Modules.System import SystemParser
 from Modules.Security import SecurityParser
 from Modules.WinRM import WinRMParser
+from Lib.multichannel import MultiChannelParser
+from Lib.batch import parse_window_bound
+from Lib.cache import ResultCache
 
 # Mapping parser types to classes
 PARSERS = {
     'ts_lsm': TerminalServicesLSMParser,
     'ts_rdp': TerminalServicesCAXParser,
     'powershell': PowerShellParser,
+    'powershell_op': PowerShellOperationalParser,
     'system': SystemParser,
     'security': SecurityParser,
     'winrm': WinRMParser
@@ -23,6 +28,7 @@ FILE_PATTERNS = {
     'ts_lsm': 'Microsoft-Windows-TerminalServices-LocalSessionManager%4Operational.evtx',
     'ts_rdp': 'Microsoft-Windows-TerminalServices-RDPClient%4Operational.evtx',
     'powershell': 'Windows PowerShell.evtx',
+    'powershell_op': 'Microsoft-Windows-PowerShell%4Operational.evtx',
     'system': 'System.evtx',
     'security': 'Security.evtx',
     'winrm': 'Microsoft-Windows-WinRM%4Operational.evtx'
@@ -34,29 +40,87 @@ class CustomArgumentParser(argparse.ArgumentParser):
         self.print_help()
         sys.exit(2)
 
+def output_destination(csv_path, name):
+    """Path of an output named '<type>' (the CSV) or '<type>.<suffix>' ('<csv>_<suffix>')."""
+    suffix = name.partition('.')[2]
+    return os.path.splitext(csv_path)[0] + '_' + suffix if suffix else csv_path
+
+def run_parser(key, evtx_path, csv_path, window, cache):
+    """Parse one file with one parser, reusing a cached result when possible.
+    Returns True if the output was restored from the cache."""
+    parser_cls = PARSERS[key]
+    cache_key = cache.make_key(evtx_path, {key: parser_cls}, key, window) if cache else None
+    names = cache.lookup(cache_key) if cache_key else None
+    if names and key in names:
+        if cache.restore(cache_key, {name: output_destination(csv_path, name) for name in names}):
+            return True
+    parser_inst = parser_cls(evtx_path, csv_path, window)
+    parser_inst.parse()
+    if cache_key:
+        outputs = {key: csv_path}
+        for suffix, path in parser_inst.extra_outputs().items():
+            outputs[f"{key}.{suffix}"] = path
+        cache.store(cache_key, outputs)
+    return False
+
+def run_multi(evtx_path, output_dir, window, cache):
+    """Single-pass parse of a merged log, reusing cached results when possible.
+    Returns (outputs, cached) where outputs maps output names to paths."""
+    multi = MultiChannelParser(evtx_path, output_dir, PARSERS, window)
+    cache_key = cache.make_key(evtx_path, PARSERS, 'multi', window) if cache else None
+    names = cache.lookup(cache_key) if cache_key else None
+    if names is not None:
+        outputs = {
+            name: output_destination(multi.output_path(name.partition('.')[0]), name)
+            for name in names
+        }
+        if cache.restore(cache_key, outputs):
+            return outputs, True
+    outputs = multi.parse()
+    if cache_key:
+        cache.store(cache_key, outputs)
+    return outputs, False
+
 def main():
     parser = CustomArgumentParser(
         description='DFIR EventLog Parser',
         epilog="""
 Available parser types:
-  ts_lsm      Microsoft-Windows-TerminalServices-LocalSessionManager%4Operational.evtx
-  ts_cax      Microsoft-Windows-TerminalServices-RDPClient%4Operational.evtx
-  powershell  Windows PowerShell.evtx
-  system      System.evtx
-  security    Security.evtx
-  winrm       Microsoft-Windows-WinRM%4Operational.evtx'
+  ts_lsm         Microsoft-Windows-TerminalServices-LocalSessionManager%4Operational.evtx
+  ts_rdp         Microsoft-Windows-TerminalServices-RDPClient%4Operational.evtx
+  powershell     Windows PowerShell.evtx
+  powershell_op  Microsoft-Windows-PowerShell%4Operational.evtx
+  system         System.evtx
+  security       Security.evtx
+  winrm          Microsoft-Windows-WinRM%4Operational.evtx
+  multi          ForwardedEvents.evtx / merged logs, one pass, one CSV per channel
 """,
         formatter_class=argparse.RawTextHelpFormatter
     )
     # Short options added for convenience
     parser.add_argument('-t', '--type',    required=True,
-                        choices=list(PARSERS.keys())+['auto'],
-                        help='Parser type to use or "auto" for directory scan')
+                        choices=list(PARSERS.keys())+['auto', 'multi'],
+                        help='Parser type to use, "auto" for directory scan or "multi" for merged logs')
     parser.add_argument('-i', '--input',   help='Path to input EVTX file')
-    parser.add_argument('-o', '--output',  help='Path to output CSV file')
-    parser.add_argument('-d', '--dir',     help='Directory with EVTX files when using auto')
+    parser.add_argument('-o', '--output',  help='Path to output CSV file (output directory when using multi)')
+    parser.add_argument('-d', '--dir',     help='Directory with EVTX files when using auto or multi')
+    parser.add_argument('--start',         help='Only events at or after this UTC time (YYYY-MM-DD[ HH:MM:SS])')
+    parser.add_argument('--end',           help='Only events before this UTC time (YYYY-MM-DD[ HH:MM:SS])')
+    parser.add_argument('--cache-dir',     help='Result cache directory (default: %%LOCALAPPDATA%% or ~/.cache)')
+    parser.add_argument('--cache-size',    type=int, default=2048, help='Result cache size limit in MB (default: 2048)')
+    parser.add_argument('--no-cache',      action='store_true', help='Always parse, never read or write the result cache')
     args = parser.parse_args()
 
+    cache = None if args.no_cache else ResultCache(args.cache_dir, args.cache_size * 1024 * 1024)
+
+    window = None
+    if args.start or args.end:
+        start = parse_window_bound(args.start) if args.start else None
+        end = parse_window_bound(args.end) if args.end else None
+        if start == -1 or end == -1:
+            parser.error('--start/--end must be formatted as YYYY-MM-DD[ HH:MM:SS]')
+        window = (start, end)
+
     if args.type == 'auto':
         if not args.dir:
             parser.error('When type is auto, --dir (-d) must be specified')
@@ -67,24 +131,41 @@ Available parser types:
             matched = False
             for key, pattern in FILE_PATTERNS.items():
                 if pattern.lower() in fname.lower():
-                    parser_cls = PARSERS[key]
                     csv_path = os.path.splitext(evtx_path)[0] + '.csv'
                     print(f"[auto] Parsing {fname} with {key} parser...")
-                    parser_inst = parser_cls(evtx_path, csv_path)
-                    parser_inst.parse()
-                    print(f"[auto] Saved CSV: {csv_path}")
+                    cached = run_parser(key, evtx_path, csv_path, window, cache)
+                    print(f"[auto] Saved CSV{' (cached)' if cached else ''}: {csv_path}")
                     matched = True
                     break
             if not matched:
                 print(f"[auto] Skipping {fname}: no matching parser pattern")
+    elif args.type == 'multi':
+        # single pass over merged logs, routed by channel
+        if args.dir:
+            evtx_paths = [os.path.join(args.dir, f) for f in os.listdir(args.dir) if f.lower().endswith('.evtx')]
+        elif args.input:
+            evtx_paths = [args.input]
+        else:
+            parser.error('When type is multi, --input (-i) or --dir (-d) must be specified')
+        for evtx_path in evtx_paths:
+            output_dir = args.output or os.path.dirname(evtx_path) or '.'
+            os.makedirs(output_dir, exist_ok=True)
+            print(f"[multi] Parsing {os.path.basename(evtx_path)} in a single pass...")
+            outputs, cached = run_multi(evtx_path, output_dir, window, cache)
+            for key, csv_path in outputs.items():
+                kind = 'files' if '.' in key else 'CSV'
+                print(f"[multi] Saved {key} {kind}{' (cached)' if cached else ''}: {csv_path}")
+            if not outputs:
+                print("[multi] No records matched any parser channel")
     else:
         # single file mode
         if not args.input or not args.output:
             parser.error('When not auto, both --input and --output must be specified')
-        parser_cls = PARSERS[args.type]
-        parser_inst = parser_cls(args.input, args.output)
-        parser_inst.parse()
-        print(f"[{args.type}] Parsing completed. Output saved to: {args.output}")
+        cached = run_parser(args.type, args.input, args.output, window, cache)
+        if cached:
+            print(f"[{args.type}] Cached result restored. Output saved to: {args.output}")
+        else:
+            print(f"[{args.type}] Parsing completed. Output saved to: {args.output}")
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
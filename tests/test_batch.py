@@ -0,0 +1,88 @@
+import ipaddress
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from Lib import batch
+
+SYSTEMTIMES = [
+    '2016-07-08 18:12:51.681640',       # python-evtx rendering
+    '2024-03-01T10:20:30.1234567Z',     # 7 fractional digits
+    '2024-03-02T00:00:00Z',
+    '2024-02-29T23:59:59.999Z',
+    '1601-01-01T00:00:00Z',
+    '1969-12-31 23:59:59',
+    '2024-13-01T00:00:00Z',             # malformed: month
+    '2024-03-01T24:00:00Z',             # malformed: hour
+    '2024-03-01',                       # malformed: no time
+    'garbage',
+    '',
+    None,                               # missing TimeCreated
+]
+
+ADDRS = [
+    '-', '', '8.8.8.8', '10.0.0.5', '172.31.255.255', '172.32.0.1', '127.0.0.1',
+    '169.254.1.1', '100.64.0.1', '224.0.0.1', '240.0.0.1', '255.255.255.255',
+    '010.1.1.1', '1.2.3', '256.1.1.1', '::1', 'fe80::1', '2001:4860:4860::8888',
+    '::ffff:8.8.8.8', 'not-an-ip',
+] + [f'192.0.0.{i}' for i in range(256)]
+
+@pytest.fixture(params=['python', 'numpy'])
+def np_mode(request, monkeypatch):
+    """Run a test with NumPy forced off, and with NumPy when installed."""
+    if request.param == 'numpy':
+        monkeypatch.setattr(batch, 'np', pytest.importorskip('numpy'))
+    else:
+        monkeypatch.setattr(batch, 'np', None)
+    return request.param
+
+def reference_filetime(sts):
+    try:
+        ts = datetime.fromisoformat(sts.rstrip('Z')[:26])
+    except (AttributeError, ValueError):
+        return -1
+    return (ts - datetime(1601, 1, 1)) // timedelta(microseconds=1) * 10
+
+def reference_public(addr):
+    try:
+        ip = ipaddress.ip_address(addr)
+    except ValueError:
+        return False
+    return not (ip.is_private or ip.is_loopback or ip.is_reserved)
+
+def random_addrs(n):
+    rnd = random.Random(1)
+    octets = [0, 10, 100, 127, 169, 172, 192, 198, 203, 224, 240, 254, 255]
+    return [
+        '.'.join(str(rnd.choice(octets) if rnd.random() < 0.5 else rnd.randrange(256)) for _ in range(4))
+        for _ in range(n)
+    ]
+
+def test_filetimes(np_mode):
+    filetimes = batch.filetime_column(SYSTEMTIMES)
+    expected = [-1 if sts is None or sts[10:11] not in ('T', ' ') else reference_filetime(sts) for sts in SYSTEMTIMES]
+    expected[1] += 7  # seventh fractional digit, beyond datetime precision
+    assert list(filetimes) == expected
+
+    formatted = batch.format_filetimes(filetimes)
+    assert formatted == [
+        None if ft < 0 else (datetime(1601, 1, 1) + timedelta(microseconds=ft // 10)).strftime('%Y-%m-%d %H:%M:%S')
+        for ft in expected
+    ]
+
+def test_window_mask(np_mode):
+    filetimes = batch.filetime_column(SYSTEMTIMES)
+    start = batch.parse_window_bound('2016-07-08')
+    end = batch.parse_window_bound('2024-03-02')
+    assert batch.window_mask(filetimes, start, end) == [start <= ft < end for ft in filetimes]
+    # Missing / malformed times never match, even without bounds
+    assert batch.window_mask(filetimes) == [ft >= 0 for ft in filetimes]
+
+def test_take_column(np_mode):
+    filetimes = batch.filetime_column(SYSTEMTIMES)
+    assert list(batch.take_column(filetimes, [1, 3, 11])) == [filetimes[1], filetimes[3], -1]
+
+def test_public_ip_mask(np_mode):
+    addrs = ADDRS + random_addrs(20000)
+    assert batch.public_ip_mask(addrs) == [reference_public(a) for a in addrs]
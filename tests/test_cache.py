@@ -0,0 +1,117 @@
+import importlib
+import os
+import sys
+
+import pytest
+
+from Lib import cache
+from Lib.cache import EVTX_CHUNK_SIZE, EVTX_HEADER_SIZE, ResultCache, evtx_fingerprint
+
+def chunk(fill: int = 1, records: bytes = b'') -> bytearray:
+    data = bytearray(b'ElfChnk\x00' + bytes([fill]) * (0x80 - 8))
+    data += records.ljust(EVTX_CHUNK_SIZE - len(data), b'\x00')
+    return data
+
+def write_evtx(path, chunks, tail: bytes = b''):
+    header = b'ElfFile\x00'.ljust(EVTX_HEADER_SIZE, b'\x02')
+    with open(path, 'wb') as f:
+        f.write(header + b''.join(chunks) + tail)
+    return str(path)
+
+class DummyParser:
+    DESC_MAP = {'1': 'One'}
+
+@pytest.fixture
+def evtx(tmp_path):
+    return write_evtx(tmp_path / 'a.evtx', [chunk(1, b'records'), chunk(2)])
+
+def test_fingerprint_not_evtx(tmp_path):
+    path = tmp_path / 'x.evtx'
+    path.write_bytes(b'not an event log')
+    assert evtx_fingerprint(str(path)) is None
+    assert ResultCache(str(tmp_path / 'cache')).make_key(str(path), {}, 'x') is None
+
+@pytest.mark.parametrize('offset', [0x08, 0x34, 0x7C])
+def test_fingerprint_follows_chunk_headers(tmp_path, evtx, offset):
+    changed = chunk(2)
+    changed[offset] ^= 0xFF
+    other = write_evtx(tmp_path / 'b.evtx', [chunk(1, b'records'), changed])
+    assert evtx_fingerprint(other) != evtx_fingerprint(evtx)
+
+def test_fingerprint_ignores_record_data_and_unused_chunks(tmp_path, evtx):
+    # Bytes beyond the checksummed chunk header are not read
+    same = write_evtx(tmp_path / 'b.evtx', [chunk(1, b'RECORDS'), chunk(2)])
+    assert evtx_fingerprint(same) == evtx_fingerprint(evtx)
+
+    # Slots without a chunk signature count as empty, whatever they hold
+    unused_a = write_evtx(tmp_path / 'c.evtx', [chunk(1), bytes(EVTX_CHUNK_SIZE)])
+    unused_b = write_evtx(tmp_path / 'd.evtx', [chunk(1), b'\xAA' * EVTX_CHUNK_SIZE])
+    assert evtx_fingerprint(unused_a) == evtx_fingerprint(unused_b)
+    # ...but still count, so the file size is part of the fingerprint
+    shorter = write_evtx(tmp_path / 'e.evtx', [chunk(1)])
+    assert evtx_fingerprint(shorter) != evtx_fingerprint(unused_a)
+
+def test_key_follows_desc_map(tmp_path, evtx, monkeypatch):
+    rc = ResultCache(str(tmp_path / 'cache'))
+    key = rc.make_key(evtx, {'dummy': DummyParser}, 'dummy')
+    assert rc.make_key(evtx, {'dummy': DummyParser}, 'dummy') == key
+    monkeypatch.setitem(DummyParser.DESC_MAP, '2', 'Two')
+    assert rc.make_key(evtx, {'dummy': DummyParser}, 'dummy') != key
+
+def test_key_follows_source(tmp_path, evtx, monkeypatch):
+    (tmp_path / 'dummy_parser.py').write_text("class Parser:\n    DESC_MAP = {}\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, 'dummy_parser', raising=False)
+    module = importlib.import_module('dummy_parser')
+    rc = ResultCache(str(tmp_path / 'cache'))
+    key = rc.make_key(evtx, {'dummy': module.Parser}, 'dummy')
+
+    (tmp_path / 'dummy_parser.py').write_text("class Parser:\n    DESC_MAP = {}  # changed\n")
+    assert rc.make_key(evtx, {'dummy': module.Parser}, 'dummy') != key
+    # Options and the IPv4 rules are part of the key too
+    assert rc.make_key(evtx, {'dummy': module.Parser}, 'other') != key
+    monkeypatch.setattr(cache.batch, 'IPV4_TABLES', None)
+    assert rc.make_key(evtx, {'dummy': module.Parser}, 'dummy') != key
+
+    # Modules whose code cannot be read are never cached
+    monkeypatch.setattr(cache, 'module_code', lambda module: None)
+    assert rc.make_key(evtx, {'dummy': module.Parser}, 'dummy') is None
+
+def test_store_and_restore_csv_with_scripts(tmp_path):
+    csv_path = tmp_path / 'a.csv'
+    csv_path.write_text('header\nrow\n')
+    scripts = tmp_path / 'a_scripts'
+    scripts.mkdir()
+    (scripts / 'abc.ps1').write_text('Get-Process')
+
+    rc = ResultCache(str(tmp_path / 'cache'))
+    assert rc.store('k', {'powershell_op': str(csv_path), 'powershell_op.scripts': str(scripts)})
+    assert rc.lookup('k') == ['powershell_op', 'powershell_op.scripts']
+    assert rc.lookup('missing') is None
+
+    stale = tmp_path / 'b_scripts'
+    stale.mkdir()
+    (stale / 'old.ps1').write_text('old')
+    assert rc.restore('k', {'powershell_op': str(tmp_path / 'b.csv'), 'powershell_op.scripts': str(stale)})
+    assert (tmp_path / 'b.csv').read_text() == 'header\nrow\n'
+    assert os.listdir(stale) == ['abc.ps1']
+    assert (stale / 'abc.ps1').read_text() == 'Get-Process'
+
+def test_evict_least_recently_used(tmp_path):
+    rc = ResultCache(str(tmp_path / 'cache'))
+    out = tmp_path / 'out.csv'
+    out.write_bytes(b'x' * 100)
+    for i, key in enumerate(['a', 'b', 'c', 'd']):
+        rc.store(key, {'csv': str(out)})
+        os.utime(os.path.join(rc.cache_dir, key), (1000 + i, 1000 + i))
+
+    # Looking an entry up marks it as recently used
+    rc.lookup('b')
+    rc.max_bytes = 250
+    rc.evict(keep='a')
+    assert sorted(os.listdir(rc.cache_dir)) == ['a', 'b']
+
+    # Entries larger than the whole cache are not stored
+    rc.max_bytes = 50
+    assert not rc.store('e', {'csv': str(out)})
+    assert 'e' not in os.listdir(rc.cache_dir)
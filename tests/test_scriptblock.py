@@ -0,0 +1,93 @@
+import hashlib
+
+from Lib.scriptblock import ScriptBlockBuffer
+
+def read_all(block):
+    with block['reader'] as reader:
+        return b''.join(reader.iter_bytes(chunk_size=3))
+
+def test_complete_at_message_total():
+    buf = ScriptBlockBuffer()
+    assert buf.add('a', 2, 3, 'two ', {'n': 2}) == []
+    assert buf.add('a', 1, 3, 'one ', {'n': 1}) == []
+    done = buf.add('a', 3, 3, 'three', {'n': 3})
+    assert len(done) == 1
+    block = done[0]
+    assert (block['id'], block['received'], block['total'], block['late']) == ('a', 3, 3, False)
+    # Metadata comes from the first part, whatever the arrival order
+    assert block['meta'] == {'n': 1}
+    assert read_all(block) == b'one two three'
+    assert buf.flush() == []
+    buf.close()
+
+def test_duplicate_and_out_of_range_parts_are_ignored():
+    buf = ScriptBlockBuffer()
+    assert buf.add('a', 1, 2, 'first', {}) == []
+    assert buf.add('a', 1, 2, 'again', {}) == []
+    assert buf.add('a', 0, 2, 'zero', {}) == []
+    assert buf.add('a', 3, 2, 'three', {}) == []
+    block, = buf.add('a', 2, 2, ' second', {})
+    assert block['received'] == 2
+    assert read_all(block) == b'first second'
+    buf.close()
+
+def test_sha256_and_size_match_parts():
+    parts = ['Write-Host "héllo"\n', '', '☃' * 1000, 'exit']
+    buf = ScriptBlockBuffer()
+    done = []
+    for number, text in enumerate(parts, 1):
+        done += buf.add('a', number, len(parts), text, {})
+    block, = done
+    expected = ''.join(parts).encode('utf-8')
+    assert block['size'] == len(expected)
+    assert block['sha256'] == hashlib.sha256(expected).hexdigest()
+    assert read_all(block) == expected
+    buf.close()
+
+def test_spill_at_max_memory(tmp_path):
+    buf = ScriptBlockBuffer(max_memory=100, spill_dir=str(tmp_path))
+    buf.add('small', 1, 2, 's' * 10, {})
+    buf.add('big', 1, 2, 'b' * 95, {})
+    # Largest block is spilled first, until memory fits again
+    assert buf._memory == 10
+    assert buf._pending['big'].spilled and not buf._pending['big'].parts
+    assert buf._pending['small'].parts
+    # Later parts of a spilled block go straight to disk
+    big, = buf.add('big', 2, 2, 'B' * 50, {})
+    assert buf._memory == 10
+    small, = buf.add('small', 2, 2, 'S', {})
+    assert read_all(big) == b'b' * 95 + b'B' * 50
+    assert read_all(small) == b's' * 10 + b'S'
+    # Spill file is shared and emptied once no block uses it
+    assert buf.spill.users == 0
+    buf.close()
+    assert buf.spill.file is None
+
+def test_evict_least_recently_updated():
+    buf = ScriptBlockBuffer(max_pending=2)
+    buf.add('a', 1, 3, 'a1', {})
+    buf.add('b', 1, 3, 'b1', {})
+    buf.add('a', 2, 3, 'a2', {})
+    # 'b' is the least recently updated block, not the oldest one
+    evicted, = buf.add('c', 1, 3, 'c1', {})
+    assert (evicted['id'], evicted['received'], evicted['late']) == ('b', 1, False)
+    assert read_all(evicted) == b'b1'
+    assert list(buf._pending) == ['a', 'c']
+
+    # Parts arriving after eviction form a new block flagged as late
+    buf.add('b', 2, 3, 'b2', {})
+    late = [block for block in buf.flush() if block['id'] == 'b']
+    assert len(late) == 1
+    assert late[0]['late'] and late[0]['received'] == 1
+    assert read_all(late[0]) == b'b2'
+    buf.close()
+
+def test_flush_emits_incomplete_blocks_in_update_order():
+    buf = ScriptBlockBuffer()
+    buf.add('a', 1, 2, 'a1', {})
+    buf.add('b', 2, 2, 'b2', {})
+    buf.add('a', 1, 2, 'a1', {})
+    blocks = buf.flush()
+    assert [block['id'] for block in blocks] == ['b', 'a']
+    assert [read_all(block) for block in blocks] == [b'b2', b'a1']
+    buf.close()